@@ -52,6 +52,12 @@ async def create_sample_comments():
             print("菜谱不存在，请先创建菜谱")
             return
         
+        # 确保评论列表分页所需的复合索引存在 (recipe_id, created_at, _id)
+        await comments_collection.create_index(
+            [("recipe_id", 1), ("created_at", -1), ("_id", -1)],
+            name="recipe_id_created_at_id"
+        )
+        
         # 删除现有评论
         await comments_collection.delete_many({"recipe_id": "681dc66f64f725c88d76041d"})
         
@@ -68,6 +74,7 @@ async def create_sample_comments():
             {
                 "$set": {
                     "stats.commentCount": len(sample_comments),
+                    "stats.ratingSum": total_rating,
                     "stats.ratingAvg": avg_rating,
                     "stats.ratingCount": len(sample_comments)
                 }
@@ -75,7 +82,9 @@ async def create_sample_comments():
         )
         
         # 确认创建成功
-        comments = await comments_collection.find({"recipe_id": "681dc66f64f725c88d76041d"}).to_list(length=10)
+        comments = await comments_collection.find(
+            {"recipe_id": "681dc66f64f725c88d76041d"}
+        ).sort([("created_at", -1), ("_id", -1)]).to_list(length=10)
         print(f"\n数据库中现有 {len(comments)} 条评论：")
         for comment in comments:
             print(f"评论ID: {comment.get('_id')}, 内容: {comment.get('content')[:20]}...")
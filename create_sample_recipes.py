@@ -227,7 +227,7 @@ async def create_sample_recipes():
             print(f"成功创建 {len(sample_recipes)} 个示例菜谱")
             
             # 确认创建成功
-            recipes = await recipes_collection.find({}).to_list(length=10)
+            recipes = await recipes_collection.find({}, {"title": 1}).to_list(length=10)
             print(f"\n数据库中现有 {len(recipes)} 个菜谱：")
             for recipe in recipes:
                 recipe_id = recipe.get("_id")
@@ -9,8 +9,8 @@ async def list_recipes():
     # 获取菜谱集合
     recipes_collection = get_collection("recipes")
     
-    # 查询所有菜谱
-    recipes = await recipes_collection.find({}).to_list(length=10)
+    # 查询所有菜谱，只取列表展示需要的字段
+    recipes = await recipes_collection.find({}, {"title": 1}).to_list(length=10)
     
     if not recipes:
         print("未找到任何菜谱")
@@ -28,7 +28,7 @@ async def list_recipes():
     specific_id = "681dc66f64f725c88d76041d"
     try:
         obj_id = ObjectId(specific_id)
-        specific_recipe = await recipes_collection.find_one({"_id": obj_id})
+        specific_recipe = await recipes_collection.find_one({"_id": obj_id}, {"title": 1})
         if specific_recipe:
             print(f"\n找到ID为 {specific_id} 的菜谱: {specific_recipe.get('title')}")
         else:
@@ -2,69 +2,197 @@
 
 """
 评论功能测试脚本
-运行方式: python run_tests.py
+运行方式: python run_tests.py [--workers N]
+
+找到 mongod 时，测试按用例分片到多个工作进程并行运行，每个工作进程启动自己的
+临时 mongod，互不共享数据；找不到 mongod 时按原方式串行运行，使用 .env 中的数据库。
 """
 
 import os
 import sys
+import glob
+import shutil
+import socket
 import subprocess
+import tempfile
+import time
 import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+# 测试套件: 名称 -> (覆盖率文件标识, 路径)
+SUITES = {
+    "API": ("api", "tests/api/v1/test_recipes.py"),
+    "服务层": ("service", "tests/services/test_comment.py"),
+}
+
+
+def collect_tests(path):
+    """收集测试套件中的用例ID，收集失败或没有用例时抛出 RuntimeError"""
+    # pytest.ini 的 addopts 带 -v，需要 -qq 才能降到逐行输出用例ID的级别
+    result = subprocess.run(
+        ["python", "-m", "pytest", "--collect-only", "-qq", "--no-cov", path],
+        capture_output=True,
+        text=True
+    )
+    tests = [line.strip() for line in result.stdout.splitlines() if "::" in line]
+    if result.returncode != 0 or not tests:
+        raise RuntimeError(f"收集 {path} 的测试用例失败 (退出码 {result.returncode}):\n"
+                           f"{result.stdout}{result.stderr}")
+    return tests
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_mongod(mongod, dbpath):
+    """启动临时 mongod，返回进程和连接地址"""
+    port = free_port()
+    process = subprocess.Popen(
+        [mongod, "--dbpath", dbpath, "--port", str(port), "--bind_ip", "127.0.0.1",
+         "--wiredTigerCacheSizeGB", "0.25", "--quiet"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"mongod 启动失败，退出码 {process.returncode}")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return process, f"mongodb://127.0.0.1:{port}/yiohyi_test"
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("等待 mongod 启动超时")
+
+
+def run_shard(suite, index, tests, mongod):
+    """在独立进程中运行一个分片；有 mongod 时使用自己的临时数据库"""
+    env = dict(os.environ)
+    # 每个进程写自己的覆盖率文件，结束后合并
+    env["COVERAGE_FILE"] = os.path.join(os.getcwd(), f".coverage.{SUITES[suite][0]}.{index}")
+    cmd = ["python", "-m", "pytest", *tests, "-v"]
+
+    mongod_process = None
+    dbpath = None
+    started = time.perf_counter()
+    try:
+        if mongod:
+            dbpath = tempfile.mkdtemp(prefix="yiohyi_test_")
+            mongod_process, env["MONGODB_URI"] = start_mongod(mongod, dbpath)
+            # pytest.ini 中 .env 会覆盖已有环境变量，这里让临时数据库地址优先
+            cmd += ["-o", "env_override_existing_values=0"]
+        result = subprocess.run(cmd, capture_output=True, text=True, env=env)
+        returncode, stdout, stderr = result.returncode, result.stdout, result.stderr
+    except RuntimeError as e:
+        returncode, stdout, stderr = 1, "", str(e)
+    finally:
+        if mongod_process:
+            mongod_process.terminate()
+            mongod_process.wait()
+        if dbpath:
+            shutil.rmtree(dbpath, ignore_errors=True)
+    return returncode, stdout, stderr, time.perf_counter() - started
+
+
+def combine_coverage():
+    files = glob.glob(".coverage.*")
+    if not files:
+        return
+    result = subprocess.run(["python", "-m", "coverage", "combine", *files], capture_output=True, text=True)
+    if result.returncode == 0:
+        subprocess.run(["python", "-m", "coverage", "report", "-m"])
+    else:
+        print("合并覆盖率数据失败:")
+        print(result.stderr)
+
 
 def main():
     parser = argparse.ArgumentParser(description="运行评论相关的测试")
     parser.add_argument("--api", action="store_true", help="只运行API测试")
     parser.add_argument("--service", action="store_true", help="只运行服务层测试")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="并行工作进程数")
+    parser.add_argument("--mongod", default=shutil.which("mongod"), help="mongod 可执行文件路径")
     args = parser.parse_args()
-    
+
     # 设置环境变量
     os.environ["PYTHONPATH"] = os.getcwd()
-    
+
     print("======= 开始运行评论功能测试 =======")
-    
-    api_result = None
-    service_result = None
-    
-    # 运行API测试
+
+    # 选择要运行的测试套件
+    suites = {}
     if not args.service:
-        print("\n--- 运行 API 测试 ---")
-        api_test_cmd = ["python", "-m", "pytest", "tests/api/v1/test_recipes.py", "-v"]
-        print(f"执行命令: {' '.join(api_test_cmd)}")
-        
-        api_result = subprocess.run(
-            api_test_cmd,
-            capture_output=True,
-            text=True
-        )
-        print(api_result.stdout)
-        if api_result.stderr:
-            print("错误信息:")
-            print(api_result.stderr)
-    
-    # 运行服务层测试
+        suites["API"] = SUITES["API"][1]
     if not args.api:
-        print("\n--- 运行服务层测试 ---")
-        service_test_cmd = ["python", "-m", "pytest", "tests/services/test_comment.py", "-v"]
-        print(f"执行命令: {' '.join(service_test_cmd)}")
-        
-        service_result = subprocess.run(
-            service_test_cmd,
-            capture_output=True,
-            text=True
-        )
-        print(service_result.stdout)
-        if service_result.stderr:
+        suites["服务层"] = SUITES["服务层"][1]
+
+    # 没有临时数据库时不能并行，避免多个进程同时读写共享数据
+    workers = args.workers if args.mongod else 1
+    if args.mongod:
+        print(f"使用临时 mongod ({args.mongod})，{workers} 个工作进程并行")
+    else:
+        print("未找到 mongod，使用 .env 中的数据库串行运行")
+
+    # 按用例分片；串行运行时整个套件作为一个分片
+    shards = []
+    for name, path in suites.items():
+        if workers == 1:
+            shards.append((name, 0, [path]))
+            continue
+        try:
+            tests = collect_tests(path)
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            return 1
+        shard_count = min(workers, len(tests))
+        for index in range(shard_count):
+            shards.append((name, index, tests[index::shard_count]))
+
+    for path in glob.glob(".coverage.*"):
+        os.remove(path)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            (name, index, executor.submit(run_shard, name, index, tests, args.mongod))
+            for name, index, tests in shards
+        ]
+    elapsed = time.perf_counter() - started
+
+    results = {}
+    durations = {}
+    for name, index, future in futures:
+        returncode, stdout, stderr, duration = future.result()
+        results[name] = results.get(name, 0) or returncode
+        durations[name] = max(durations.get(name, 0), duration)
+        print(f"\n--- {name} 测试输出 (分片 {index}, {duration:.1f}s) ---")
+        print(stdout)
+        if stderr:
             print("错误信息:")
-            print(service_result.stderr)
-    
+            print(stderr)
+
+    combine_coverage()
+
+    api_result = results.get("API")
+    service_result = results.get("服务层")
+
     # 输出测试总结
     print("\n======= 测试结果摘要 =======")
-    
+
     has_api = api_result is not None
     has_service = service_result is not None
-    
-    api_ok = has_api and api_result.returncode == 0
-    service_ok = has_service and service_result.returncode == 0
-    
+
+    api_ok = has_api and api_result == 0
+    service_ok = has_service and service_result == 0
+
+    for name, duration in durations.items():
+        print(f"{name} 测试耗时: {duration:.1f}s (最慢分片)")
+    print(f"总耗时: {elapsed:.1f}s")
+
     if (has_api and has_service and api_ok and service_ok) or \
        (has_api and not has_service and api_ok) or \
        (has_service and not has_api and service_ok):
@@ -79,4 +207,4 @@ def main():
         return 1
 
 if __name__ == "__main__":
-    sys.exit(main()) 
\ No newline at end of file
+    sys.exit(main())
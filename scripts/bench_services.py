@@ -0,0 +1,241 @@
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import time
+from types import SimpleNamespace
+from run_tests import start_mongod
+
+# app 模块在连接地址确定后才导入(见 main)，保证配置读取的是临时 mongod 的 MONGODB_URI
+
+# 固定规模的基准数据，使用独立的 seed，运行结束后删除
+FIXTURE = SimpleNamespace(seed=990001, users=200, recipes=1000, comments=20000, home_contents=30)
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+
+INSERT_BATCH_SIZE = 1000
+
+FIXTURE_COLLECTIONS = ["users", "recipes", "comments", "home_contents"]
+
+LOCAL_HOSTS = ("localhost", "127.0.0.1", "::1")
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return round(sorted_values[index], 3)
+
+
+def build_fixtures():
+    """按固定 seed 生成基准数据，返回 集合名 -> 文档列表"""
+    from generate_sample_data import (
+        build_comment,
+        build_home_content,
+        build_recipe,
+        build_user,
+        document_rng,
+        zipf_cum_weights,
+    )
+
+    def build_bench_user(rng, index):
+        user = build_user(FIXTURE, rng, index, "bench")
+        # 手机号带上 seed，避免与 generate_sample_data 生成的用户冲突
+        user["phone"] = f"1{FIXTURE.seed:06d}{index:04d}"
+        return user
+
+    recipe_cum_weights = zipf_cum_weights(FIXTURE.recipes, 1.1)
+    builders = {
+        "users": build_bench_user,
+        "recipes": lambda rng, i: build_recipe(FIXTURE, rng, i),
+        "comments": lambda rng, i: build_comment(FIXTURE, rng, i, recipe_cum_weights),
+        "home_contents": lambda rng, i: build_home_content(FIXTURE, rng, i),
+    }
+    fixtures = {}
+    for entity, build in builders.items():
+        fixtures[entity] = [
+            build(document_rng(FIXTURE.seed, entity, index), index)
+            for index in range(getattr(FIXTURE, entity))
+        ]
+    return fixtures
+
+
+async def seed_fixtures(fixtures):
+    """写入基准数据；任何写入错误(包括重复键)都直接抛出，保证数据规模固定"""
+    from app.db.mongodb import get_collection
+    for entity, documents in fixtures.items():
+        collection = get_collection(entity)
+        for start in range(0, len(documents), INSERT_BATCH_SIZE):
+            await collection.insert_many(documents[start:start + INSERT_BATCH_SIZE], ordered=False)
+
+
+async def remove_fixtures(fixtures):
+    from app.db.mongodb import get_collection
+    for entity, documents in fixtures.items():
+        collection = get_collection(entity)
+        ids = [document["_id"] for document in documents]
+        for start in range(0, len(ids), INSERT_BATCH_SIZE):
+            await collection.delete_many({"_id": {"$in": ids[start:start + INSERT_BATCH_SIZE]}})
+
+
+def build_benchmarks(fixtures):
+    """各服务热点函数的调用，菜谱 0 是 Zipf 分布中评论最多的菜谱"""
+    from app.services.comment import get_recipe_comments, get_comment_by_id
+    from app.services.homepage import get_swipers
+    from app.services.ingredient import get_ingredient_categories, recognize_ingredient
+    from app.services.recipe import get_recipe_by_id
+    from generate_sample_data import make_id
+
+    hot_recipe_id = str(make_id(FIXTURE.seed, "recipes", 0))
+    hot_comment = next(c for c in fixtures["comments"] if c["recipe_id"] == hot_recipe_id)
+    hot_comment_count = sum(1 for c in fixtures["comments"] if c["recipe_id"] == hot_recipe_id)
+    deep_page = max(1, hot_comment_count // 10)
+    return {
+        "comment.get_recipe_comments[page=1]": lambda: get_recipe_comments(hot_recipe_id, page=1, limit=10),
+        f"comment.get_recipe_comments[page={deep_page}]": lambda: get_recipe_comments(
+            hot_recipe_id, page=deep_page, limit=10),
+        "comment.get_comment_by_id": lambda: get_comment_by_id(hot_recipe_id, str(hot_comment["_id"])),
+        "homepage.get_swipers": lambda: get_swipers(),
+        "recipe.get_recipe_by_id": lambda: get_recipe_by_id(hot_recipe_id),
+        "ingredient.get_ingredient_categories": lambda: get_ingredient_categories(),
+        "ingredient.recognize_ingredient": lambda: recognize_ingredient("500克土豆"),
+    }
+
+
+async def run_benchmark(call, iterations, warmup):
+    for _ in range(warmup):
+        await call()
+
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        call_started = time.perf_counter()
+        await call()
+        latencies.append((time.perf_counter() - call_started) * 1000)
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "ops": round(iterations / elapsed, 2) if elapsed else 0,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+    }
+
+
+def compare_with_baseline(results, baseline, threshold):
+    """返回超出阈值的退化项"""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            # 缺少基线视为失败，避免空基线让检查形同虚设
+            regressions.append(f"{name}: 无基线，请使用 --update-baseline 生成")
+            continue
+        if result["ops"] < base["ops"] * (1 - threshold):
+            regressions.append(f"{name}: ops/s {result['ops']} < 基线 {base['ops']}")
+        if result["p95_ms"] > base["p95_ms"] * (1 + threshold):
+            regressions.append(f"{name}: p95 {result['p95_ms']}ms > 基线 {base['p95_ms']}ms")
+    return regressions
+
+
+async def check_database():
+    """没有临时 mongod 时，只允许在本地且为空的数据库上运行"""
+    from app.db.mongodb import get_database
+    db = await get_database()
+    await db.command("ping")
+    host, _ = db.client.address
+    if host not in LOCAL_HOSTS:
+        return f"数据库不在本地 ({host})"
+    for name in FIXTURE_COLLECTIONS:
+        if await db[name].estimated_document_count():
+            return f"数据库中 {name} 集合不为空"
+    return None
+
+
+async def run(args):
+    from app.db.mongodb import connect_to_mongo
+
+    print("连接到 MongoDB...")
+    await connect_to_mongo()
+
+    if not args.mongod:
+        problem = await check_database()
+        if problem:
+            print(f"{problem}，基准测试需要本地空数据库；请安装 mongod 或通过 --mongod 指定")
+            return None
+
+    fixtures = build_fixtures()
+    print(f"写入基准数据: {', '.join(f'{k} {len(v)} 条' for k, v in fixtures.items())}")
+
+    results = {}
+    try:
+        await seed_fixtures(fixtures)
+        for name, call in build_benchmarks(fixtures).items():
+            results[name] = await run_benchmark(call, args.iterations, args.warmup)
+            item = results[name]
+            print(f"{name:<48}{item['ops']:>10} ops/s  p50 {item['p50_ms']}ms  "
+                  f"p95 {item['p95_ms']}ms  p99 {item['p99_ms']}ms")
+    finally:
+        await remove_fixtures(fixtures)
+        print("已删除基准数据")
+    return results
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="服务层基准测试，在临时启动的本地 mongod 上运行")
+    parser.add_argument("--iterations", type=int, default=200, help="每个基准的调用次数")
+    parser.add_argument("--warmup", type=int, default=20, help="预热调用次数")
+    parser.add_argument("--threshold", type=float, default=0.2, help="允许的退化比例")
+    parser.add_argument("--mongod", default=shutil.which("mongod"), help="mongod 可执行文件路径")
+    parser.add_argument("--update-baseline", action="store_true", help="用本次结果更新基线文件")
+    parser.add_argument("--output", help="JSON 结果输出文件")
+    args = parser.parse_args()
+
+    mongod_process = None
+    dbpath = None
+    try:
+        if args.mongod:
+            dbpath = tempfile.mkdtemp(prefix="yiohyi_bench_")
+            mongod_process, os.environ["MONGODB_URI"] = start_mongod(args.mongod, dbpath)
+            print(f"已启动临时 mongod: {os.environ['MONGODB_URI']}")
+        results = await run(args)
+    finally:
+        if mongod_process:
+            mongod_process.terminate()
+            mongod_process.wait()
+        if dbpath:
+            shutil.rmtree(dbpath, ignore_errors=True)
+
+    if results is None:
+        return 1
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+    if args.update_baseline:
+        with open(BASELINE_FILE, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"基线已更新: {BASELINE_FILE}")
+        return 0
+
+    with open(BASELINE_FILE, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    print("\n======= 基线对比 =======")
+    regressions = compare_with_baseline(results, baseline, args.threshold)
+    if regressions:
+        print("❌ 基线检查未通过:")
+        for regression in regressions:
+            print(f"- {regression}")
+        return 1
+    print("✅ 未发现超出阈值的退化")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
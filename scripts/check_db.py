@@ -2,6 +2,16 @@ import asyncio
 from app.db.mongodb import connect_to_mongo, get_collection
 from app.models.homepage import ContentType
 
+SECTION_LIMIT = 10
+
+
+def section_pipeline(content_type):
+    return [
+        {"$match": {"type": content_type}},
+        {"$sort": {"sort_order": 1}},
+        {"$limit": SECTION_LIMIT}
+    ]
+
 
 async def check_swipers():
     print("尝试连接到 MongoDB...")
@@ -12,7 +22,8 @@ async def check_swipers():
         collection = get_collection('home_contents')
         print("获取 home_contents 集合")
         
-        swipers = await collection.find({'type': 'swiper'}).to_list(length=10)
+        # 过滤和排序都可以走 (type, sort_order) 索引
+        swipers = await collection.find({'type': 'swiper'}).sort('sort_order', 1).to_list(length=SECTION_LIMIT)
         print(f'找到 {len(swipers)} 个轮播图数据')
         
         for swiper in swipers:
@@ -21,15 +32,23 @@ async def check_swipers():
         if len(swipers) == 0:
             print("检查 initialize_default_swipers 函数是否被正确调用")
             
-            # 检查其他内容类型是否有数据
-            featured = await collection.find({'type': 'featured'}).to_list(length=10)
-            popular = await collection.find({'type': 'popular'}).to_list(length=10)
+            # 检查其他内容类型是否有数据：一次聚合取回精选和热门内容
+            # 只有开头的 $match 能用索引，$facet 内的排序在内存中完成
+            pipeline = [
+                {"$match": {"type": {"$in": ["featured", "popular"]}}},
+                {"$facet": {
+                    "featured": section_pipeline("featured"),
+                    "popular": section_pipeline("popular")
+                }}
+            ]
+            result = await collection.aggregate(pipeline).to_list(length=1)
+            sections = result[0] if result else {}
             
-            print(f'精选内容: {len(featured)} 条')
-            print(f'热门内容: {len(popular)} 条')
+            print(f"精选内容: {len(sections.get('featured', []))} 条")
+            print(f"热门内容: {len(sections.get('popular', []))} 条")
     except Exception as e:
         print(f"发生错误: {str(e)}")
 
 
 if __name__ == "__main__":
-    asyncio.run(check_swipers()) 
\ No newline at end of file
+    asyncio.run(check_swipers())
@@ -0,0 +1,149 @@
+import argparse
+import asyncio
+from app.db.mongodb import connect_to_mongo, get_collection
+
+# 各集合热点查询所需的索引: 集合名 -> [(索引名, 索引键, 选项)]
+INDEX_REGISTRY = {
+    "comments": [
+        ("recipe_id_created_at_id", [("recipe_id", 1), ("created_at", -1), ("_id", -1)], {}),
+    ],
+    "home_contents": [
+        ("type_sort_order", [("type", 1), ("sort_order", 1)], {}),
+    ],
+    "users": [
+        ("username_unique", [("username", 1)],
+         {"unique": True, "partialFilterExpression": {"username": {"$type": "string"}}}),
+        ("openid_unique", [("openid", 1)],
+         {"unique": True, "partialFilterExpression": {"openid": {"$type": "string"}}}),
+        ("email_unique", [("email", 1)],
+         {"unique": True, "partialFilterExpression": {"email": {"$type": "string"}}}),
+        ("phone_unique", [("phone", 1)],
+         {"unique": True, "partialFilterExpression": {"phone": {"$type": "string"}}}),
+    ],
+    "recipes": [
+        ("status_category", [("status", 1), ("category", 1)], {}),
+        ("status_tags", [("status", 1), ("tags", 1)], {}),
+    ],
+}
+
+# 各服务的典型查询形状，用于 explain 检查是否出现全表扫描
+QUERY_SHAPES = [
+    ("comments", {"recipe_id": "681dc66f64f725c88d76041d"}, [("created_at", -1), ("_id", -1)]),
+    ("home_contents", {"type": "swiper"}, [("sort_order", 1)]),
+    ("users", {"username": "testuser"}, None),
+    ("users", {"openid": "test_openid"}, None),
+    ("users", {"email": "test@example.com"}, None),
+    ("users", {"phone": "13512340000"}, None),
+    ("recipes", {"status": "published", "category": "荤菜"}, None),
+    ("recipes", {"status": "published", "tags": "家常菜"}, None),
+]
+
+
+def find_stages(plan, stage_name):
+    """递归查找执行计划中的指定阶段"""
+    if isinstance(plan, dict):
+        if plan.get("stage") == stage_name:
+            return True
+        return any(find_stages(value, stage_name) for value in plan.values())
+    if isinstance(plan, list):
+        return any(find_stages(item, stage_name) for item in plan)
+    return False
+
+
+def option_mismatches(info, options):
+    """比较已存在索引与注册表中的 unique / partialFilterExpression 选项"""
+    mismatches = []
+    if bool(info.get("unique", False)) != bool(options.get("unique", False)):
+        mismatches.append(f"unique={bool(info.get('unique', False))}，应为 {bool(options.get('unique', False))}")
+    existing_filter = info.get("partialFilterExpression")
+    declared_filter = options.get("partialFilterExpression")
+    if (dict(existing_filter) if existing_filter else None) != declared_filter:
+        mismatches.append(f"partialFilterExpression={existing_filter}，应为 {declared_filter}")
+    return mismatches
+
+
+async def diff_indexes(apply=False):
+    """对比注册表与数据库中的索引，返回缺失、选项不一致和创建失败的索引数"""
+    counts = {"missing": 0, "mismatched": 0, "failed": 0}
+    for collection_name, indexes in INDEX_REGISTRY.items():
+        collection = get_collection(collection_name)
+        existing = await collection.index_information()
+        existing_keys = {tuple(info["key"]): name for name, info in existing.items()}
+        declared_keys = set()
+        
+        print(f"\n[{collection_name}]")
+        for name, keys, options in indexes:
+            declared_keys.add(tuple(keys))
+            if tuple(keys) in existing_keys:
+                existing_name = existing_keys[tuple(keys)]
+                mismatches = option_mismatches(existing[existing_name], options)
+                if mismatches:
+                    # 选项不同的索引无法直接重建，需要人工处理
+                    counts["mismatched"] += 1
+                    print(f"  选项不一致: {name} ({existing_name}): {'; '.join(mismatches)}")
+                else:
+                    print(f"  已存在: {name} ({existing_name})")
+                continue
+            
+            counts["missing"] += 1
+            if apply:
+                try:
+                    await collection.create_index(keys, name=name, **options)
+                    print(f"  已创建: {name} {keys}")
+                except Exception as e:
+                    counts["failed"] += 1
+                    print(f"  创建失败: {name} {keys}: {str(e)}")
+            else:
+                print(f"  缺失: {name} {keys}")
+        
+        for keys, name in existing_keys.items():
+            if name != "_id_" and keys not in declared_keys:
+                print(f"  未登记: {name} {list(keys)}")
+    
+    return counts
+
+
+async def explain_query_shapes():
+    """对每个查询形状执行 explain，返回出现 COLLSCAN 的数量"""
+    collscan_count = 0
+    print("\n[explain]")
+    for collection_name, query, sort in QUERY_SHAPES:
+        cursor = get_collection(collection_name).find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        plan = await cursor.explain()
+        winning_plan = plan.get("queryPlanner", {}).get("winningPlan", {})
+        if find_stages(winning_plan, "COLLSCAN"):
+            collscan_count += 1
+            print(f"  COLLSCAN: {collection_name} {query} sort={sort}")
+        else:
+            print(f"  OK: {collection_name} {query} sort={sort}")
+    return collscan_count
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="检查 MongoDB 索引与注册表的差异")
+    parser.add_argument("--apply", action="store_true", help="创建缺失的索引")
+    parser.add_argument("--explain", action="store_true", help="对查询形状执行 explain 并检查 COLLSCAN")
+    args = parser.parse_args()
+    
+    print("连接到 MongoDB...")
+    await connect_to_mongo()
+    
+    counts = await diff_indexes(apply=args.apply)
+    collscan_count = await explain_query_shapes() if args.explain else 0
+    
+    print("\n======= 索引检查摘要 =======")
+    print(f"缺失索引: {counts['missing']}")
+    print(f"选项不一致: {counts['mismatched']}")
+    if args.apply:
+        print(f"创建失败: {counts['failed']}")
+    if args.explain:
+        print(f"全表扫描查询: {collscan_count}")
+    
+    if collscan_count or counts["mismatched"] or counts["failed"] or (counts["missing"] and not args.apply):
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
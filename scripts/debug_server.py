@@ -3,6 +3,7 @@ import os
 import logging
 import sys
 from bson import ObjectId
+from pymongo import monitoring
 from app.db.mongodb import connect_to_mongo, get_collection
 from app.services.recipe import get_recipe_by_id
 
@@ -16,6 +17,68 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# 超过该耗时(毫秒)的命令按慢查询记录
+SLOW_QUERY_MS = 100
+
+
+def command_target(event):
+    """返回命令作用的集合名和查询形状"""
+    command = event.command
+    if event.command_name == "getMore":
+        return command.get("collection"), None
+    collection = command.get(event.command_name)
+    if not isinstance(collection, str):
+        # 管理类命令(如 ping、isMaster)的值为 1，没有集合
+        collection = None
+    if event.command_name == "aggregate":
+        return collection, command.get("pipeline")
+    return collection, command.get("filter")
+
+
+class CommandLogger(monitoring.CommandListener):
+    """记录每条 MongoDB 命令的集合、耗时和返回文档数"""
+
+    def __init__(self):
+        self._commands = {}
+        # 游标ID -> 创建该游标的查询形状，供 getMore 慢查询记录使用
+        self._cursors = {}
+
+    def started(self, event):
+        collection, query = command_target(event)
+        cursor_id = event.command.get("getMore") if event.command_name == "getMore" else None
+        if cursor_id is not None:
+            query = self._cursors.get(cursor_id)
+        self._commands[event.request_id] = (collection, query, cursor_id)
+        logger.debug(f"[mongo] {event.command_name} {collection} 开始: {query}")
+
+    def succeeded(self, event):
+        collection, query, getmore_cursor_id = self._commands.pop(event.request_id, (None, None, None))
+        duration_ms = event.duration_micros / 1000
+        cursor = event.reply.get("cursor", {})
+        batch = cursor.get("firstBatch", cursor.get("nextBatch"))
+        docs = len(batch) if batch is not None else "-"
+        if cursor.get("id"):
+            self._cursors[cursor["id"]] = query
+        elif getmore_cursor_id is not None:
+            # 游标已耗尽
+            self._cursors.pop(getmore_cursor_id, None)
+        message = f"[mongo] {event.command_name} {collection} 完成: {duration_ms:.2f}ms, 返回 {docs} 条"
+        if duration_ms >= SLOW_QUERY_MS:
+            logger.warning(f"{message} (慢查询: {query})")
+        else:
+            logger.debug(message)
+
+    def failed(self, event):
+        collection, query, getmore_cursor_id = self._commands.pop(event.request_id, (None, None, None))
+        if getmore_cursor_id is not None:
+            self._cursors.pop(getmore_cursor_id, None)
+        duration_ms = event.duration_micros / 1000
+        logger.error(f"[mongo] {event.command_name} {collection} 失败: {duration_ms:.2f}ms, {event.failure}")
+
+
+# 必须在创建 MongoDB 客户端之前注册
+monitoring.register(CommandLogger())
+
 
 async def debug_recipe_retrieval():
     logger.info("开始调试菜谱获取")
@@ -0,0 +1,283 @@
+import argparse
+import asyncio
+import hashlib
+import random
+import re
+import time
+from datetime import datetime, timedelta
+from bson import ObjectId
+from passlib.context import CryptContext
+from pymongo.errors import BulkWriteError
+from app.db.mongodb import connect_to_mongo, get_collection
+
+# 生成数据所有时间都相对该时间点，保证同一 seed 结果一致
+BASE_TIME = datetime(2025, 1, 1)
+
+ENTITY_CODES = {
+    "users": 1,
+    "recipes": 2,
+    "comments": 3,
+    "home_contents": 4,
+}
+
+CATEGORIES = ["荤菜", "素菜", "汤羹", "主食", "凉菜", "甜品"]
+CUISINES = ["川菜", "粤菜", "鲁菜", "苏菜", "湘菜", "家常菜"]
+DIFFICULTIES = ["简单", "中等", "困难"]
+TAGS = ["家常菜", "下饭菜", "快手菜", "肉类", "素食", "红烧", "清蒸", "凉拌", "早餐", "宴客菜"]
+INGREDIENTS = ["五花肉", "鸡蛋", "土豆", "番茄", "豆腐", "青椒", "鸡腿", "排骨", "白菜", "虾仁"]
+UNITS = ["克", "个", "勺", "片", "瓣"]
+COMMENT_PHRASES = [
+    "做法很正宗", "家人都说好吃", "步骤很清楚", "火候要注意", "下次还会再做",
+    "建议少放点盐", "肥而不腻", "口感很好", "第一次做就成功了", "加了点辣椒更香"
+]
+CONTENT_TYPES = ["swiper", "featured", "popular"]
+
+
+def make_id(seed, entity, index):
+    """根据 seed、实体类型和序号生成确定的 ObjectId"""
+    timestamp = int((BASE_TIME - datetime(1970, 1, 1)).total_seconds()) + index // 1000
+    seed_bytes = hashlib.md5(str(seed).encode()).digest()[:2]
+    return ObjectId(
+        timestamp.to_bytes(4, "big")
+        + ENTITY_CODES[entity].to_bytes(1, "big")
+        + seed_bytes
+        + index.to_bytes(5, "big")
+    )
+
+
+def document_rng(seed, entity, index):
+    """每个文档使用独立的随机数生成器，结果与批次大小和并发度无关"""
+    return random.Random(f"{seed}:{entity}:{index}")
+
+
+def zipf_cum_weights(n, exponent):
+    """按 Zipf 分布生成累计权重，排名越靠前越热门"""
+    cum_weights = []
+    total = 0.0
+    for rank in range(1, n + 1):
+        total += 1.0 / rank ** exponent
+        cum_weights.append(total)
+    return cum_weights
+
+
+def random_time(rng, days=365):
+    return BASE_TIME - timedelta(seconds=rng.randrange(days * 86400))
+
+
+def build_user(args, rng, index, password_hash):
+    created_at = random_time(rng)
+    return {
+        "_id": make_id(args.seed, "users", index),
+        "username": f"gen{args.seed}_user{index}",
+        "email": f"gen{args.seed}_user{index}@example.com",
+        "phone": f"13{index:09d}",
+        "openid": f"gen_openid_{args.seed}_{index}",
+        "passwordHash": password_hash,
+        "profile": {
+            "nickname": f"用户{index}",
+            "avatar": f"/static/avatars/{index % 50}.png",
+            "bio": "",
+            "gender": rng.choice(["unknown", "male", "female"]),
+            "location": ""
+        },
+        "stats": {
+            "recipeCount": 0,
+            "followingCount": 0,
+            "followersCount": 0,
+            "favoriteCount": 0,
+            "orderCount": 0
+        },
+        "is_active": True,
+        "created_at": created_at,
+        "updated_at": created_at
+    }
+
+
+def build_recipe(args, rng, index):
+    creator_index = rng.randrange(args.users)
+    prep_time = rng.choice([5, 10, 15, 20, 30])
+    cook_time = rng.choice([10, 20, 30, 60, 90])
+    created_at = random_time(rng)
+    step_count = rng.randint(3, 10)
+    return {
+        "_id": make_id(args.seed, "recipes", index),
+        "title": f"{rng.choice(CUISINES)}{rng.choice(INGREDIENTS)}{index}",
+        "coverImage": f"/static/recipes/gen_{index}.jpg",
+        "description": "，".join(rng.sample(COMMENT_PHRASES, 2)),
+        "tags": rng.sample(TAGS, rng.randint(1, 4)),
+        "category": rng.choice(CATEGORIES),
+        "cuisine": rng.choice(CUISINES),
+        "difficulty": rng.choice(DIFFICULTIES),
+        "prepTime": prep_time,
+        "cookTime": cook_time,
+        "totalTime": prep_time + cook_time,
+        "servings": rng.randint(1, 6),
+        "creator": {
+            "userId": str(make_id(args.seed, "users", creator_index)),
+            "nickname": f"用户{creator_index}",
+            "avatar": f"/static/avatars/{creator_index % 50}.png"
+        },
+        "ingredients": [
+            {
+                "name": name,
+                "amount": str(rng.randint(1, 500)),
+                "unit": rng.choice(UNITS)
+            }
+            for name in rng.sample(INGREDIENTS, rng.randint(2, 8))
+        ],
+        "steps": [
+            {
+                "stepNumber": step,
+                "description": rng.choice(COMMENT_PHRASES),
+                "image": f"/static/recipes/steps/gen_{index}_{step}.jpg"
+            }
+            for step in range(1, step_count + 1)
+        ],
+        "tips": rng.choice(COMMENT_PHRASES),
+        "isPublic": True,
+        "isOrigin": True,
+        "sourceId": None,
+        "status": "published",
+        "stats": {
+            "viewCount": int(rng.paretovariate(1.2) * 10),
+            "favoriteCount": 0,
+            "commentCount": 0,
+            "cookCount": 0,
+            "ratingSum": 0,
+            "ratingAvg": 0.0,
+            "ratingCount": 0
+        },
+        "createdAt": created_at,
+        "updatedAt": created_at
+    }
+
+
+def build_comment(args, rng, index, recipe_cum_weights):
+    # 评论集中在少数热门菜谱上，评论长度和点赞数呈长尾分布
+    recipe_index = rng.choices(range(args.recipes), cum_weights=recipe_cum_weights)[0]
+    user_index = rng.randrange(args.users)
+    phrase_count = min(int(rng.paretovariate(1.5)), 20)
+    created_at = random_time(rng)
+    return {
+        "_id": make_id(args.seed, "comments", index),
+        "recipe_id": str(make_id(args.seed, "recipes", recipe_index)),
+        "user_id": str(make_id(args.seed, "users", user_index)),
+        "content": "，".join(rng.choice(COMMENT_PHRASES) for _ in range(phrase_count)) + "！",
+        "rating": rng.choices([1, 2, 3, 4, 5], weights=[2, 3, 10, 35, 50])[0],
+        "images": [],
+        "likes": int(rng.paretovariate(1.3)) - 1,
+        "created_at": created_at,
+        "updated_at": created_at
+    }
+
+
+def build_home_content(args, rng, index):
+    content_type = CONTENT_TYPES[index % len(CONTENT_TYPES)]
+    recipe_index = rng.randrange(args.recipes)
+    return {
+        "_id": make_id(args.seed, "home_contents", index),
+        "type": content_type,
+        "title": f"{content_type}-{index}",
+        "image_url": f"/static/home/gen_{index}.png",
+        "description": rng.choice(COMMENT_PHRASES),
+        "tags": [{"text": rng.choice(TAGS), "theme": "primary"}],
+        "recipe_id": str(make_id(args.seed, "recipes", recipe_index)),
+        "sort_order": index // len(CONTENT_TYPES),
+        "created_at": BASE_TIME,
+        "updated_at": BASE_TIME
+    }
+
+
+async def insert_batch(collection, documents):
+    """无序批量插入，已存在的文档(重复执行时)跳过，其他写入错误照常抛出"""
+    try:
+        result = await collection.insert_many(documents, ordered=False)
+        return len(result.inserted_ids)
+    except BulkWriteError as e:
+        write_errors = e.details.get("writeErrors", [])
+        if e.details.get("writeConcernErrors") or any(error.get("code") != 11000 for error in write_errors):
+            raise
+        return e.details.get("nInserted", 0)
+
+
+async def find_other_seed(seed):
+    """查找数据库中其他 seed 生成的用户，返回其 openid"""
+    user = await get_collection("users").find_one(
+        {"$and": [
+            {"openid": {"$regex": "^gen_openid_"}},
+            {"openid": {"$not": re.compile(f"^gen_openid_{seed}_")}}
+        ]},
+        {"openid": 1}
+    )
+    return user["openid"] if user else None
+
+
+async def generate(entity, total, build, args):
+    """多个生产者并发生成并写入一个集合"""
+    collection = get_collection(entity)
+    batch_count = (total + args.batch_size - 1) // args.batch_size
+    queue = asyncio.Queue()
+    for batch_index in range(batch_count):
+        queue.put_nowait(batch_index)
+
+    inserted = 0
+
+    async def producer():
+        nonlocal inserted
+        while not queue.empty():
+            batch_index = queue.get_nowait()
+            start = batch_index * args.batch_size
+            end = min(start + args.batch_size, total)
+            documents = [build(document_rng(args.seed, entity, index), index) for index in range(start, end)]
+            inserted += await insert_batch(collection, documents)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(producer() for _ in range(args.producers)))
+    elapsed = time.perf_counter() - started
+    rate = total / elapsed if elapsed else 0
+    print(f"{entity}: 生成 {total} 条，新插入 {inserted} 条，耗时 {elapsed:.1f}s ({rate:.0f} 条/秒)")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="生成可复现的大规模测试数据")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子，相同种子生成相同数据")
+    parser.add_argument("--users", type=int, default=10000, help="用户数量")
+    parser.add_argument("--recipes", type=int, default=50000, help="菜谱数量")
+    parser.add_argument("--comments", type=int, default=500000, help="评论数量")
+    parser.add_argument("--home-contents", type=int, default=30, help="首页内容数量")
+    parser.add_argument("--zipf", type=float, default=1.1, help="菜谱热度的 Zipf 指数")
+    parser.add_argument("--batch-size", type=int, default=1000, help="每批插入的文档数")
+    parser.add_argument("--producers", type=int, default=4, help="并发生产者数量")
+    args = parser.parse_args()
+
+    if args.users < 1 or args.recipes < 1:
+        parser.error("--users 和 --recipes 至少为 1")
+
+    print("连接到 MongoDB...")
+    await connect_to_mongo()
+
+    # 手机号等唯一字段不随 seed 变化，不同 seed 的数据不能写入同一个数据库
+    other_openid = await find_other_seed(args.seed)
+    if other_openid:
+        print(f"数据库中已有其他 seed 生成的数据 ({other_openid})，请换用空数据库或使用相同的 --seed")
+        return 1
+
+    # 所有生成用户共用同一个密码 Password123，只计算一次哈希
+    password_hash = CryptContext(schemes=["bcrypt"], deprecated="auto").hash("Password123")
+    recipe_cum_weights = zipf_cum_weights(args.recipes, args.zipf)
+
+    await generate("users", args.users,
+                   lambda rng, i: build_user(args, rng, i, password_hash), args)
+    await generate("recipes", args.recipes,
+                   lambda rng, i: build_recipe(args, rng, i), args)
+    await generate("comments", args.comments,
+                   lambda rng, i: build_comment(args, rng, i, recipe_cum_weights), args)
+    await generate("home_contents", args.home_contents,
+                   lambda rng, i: build_home_content(args, rng, i), args)
+
+    print("\n数据生成完成，运行 scripts/reconcile_recipe_stats.py 更新菜谱评论统计")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
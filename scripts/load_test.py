@@ -0,0 +1,318 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import datetime
+import httpx
+
+# 各接口路径，按本地服务的路由调整
+ENDPOINTS = {
+    "register": ("POST", "/api/v1/auth/register"),
+    "login": ("POST", "/api/v1/auth/login"),
+    "profile": ("GET", "/api/v1/users/profile"),
+    "homepage": ("GET", "/api/v1/homepage/swipers"),
+    "recipe_detail": ("GET", "/api/v1/recipes/{recipe_id}"),
+    "comment_list": ("GET", "/api/v1/recipes/{recipe_id}/comments"),
+    "comment_post": ("POST", "/api/v1/recipes/{recipe_id}/comments"),
+}
+
+# 延迟直方图的桶上限(毫秒)
+HISTOGRAM_BUCKETS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+DEFAULT_MIX = "auth=1,homepage=5,recipe=3,comments=2"
+
+
+class Stats:
+    """按接口统计请求数、错误数和延迟"""
+
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+        self.status_codes = {}
+        self.queue_waits = {}
+
+    def record(self, name, latency_ms, status_code):
+        self.latencies.setdefault(name, []).append(latency_ms)
+        codes = self.status_codes.setdefault(name, {})
+        codes[str(status_code)] = codes.get(str(status_code), 0) + 1
+        if status_code is None or status_code >= 400:
+            self.record_error(name)
+
+    def record_error(self, name):
+        self.errors[name] = self.errors.get(name, 0) + 1
+
+    def record_queue_wait(self, scenario, wait_ms):
+        self.queue_waits.setdefault(scenario, []).append(wait_ms)
+
+    def queue_wait_report(self):
+        report = {}
+        for scenario, values in sorted(self.queue_waits.items()):
+            values = sorted(values)
+            report[scenario] = {
+                "scenarios": len(values),
+                "p50_ms": percentile(values, 50),
+                "p95_ms": percentile(values, 95),
+                "p99_ms": percentile(values, 99),
+                "max_ms": round(values[-1], 2)
+            }
+        return report
+
+    def report(self, elapsed):
+        endpoints = {}
+        for name, values in sorted(self.latencies.items()):
+            values = sorted(values)
+            histogram = {f"<={bucket}ms": 0 for bucket in HISTOGRAM_BUCKETS}
+            histogram[f">{HISTOGRAM_BUCKETS[-1]}ms"] = 0
+            for value in values:
+                for bucket in HISTOGRAM_BUCKETS:
+                    if value <= bucket:
+                        histogram[f"<={bucket}ms"] += 1
+                        break
+                else:
+                    histogram[f">{HISTOGRAM_BUCKETS[-1]}ms"] += 1
+            endpoints[name] = {
+                "requests": len(values),
+                "errors": self.errors.get(name, 0),
+                "throughput": round(len(values) / elapsed, 2) if elapsed else 0,
+                "p50_ms": percentile(values, 50),
+                "p95_ms": percentile(values, 95),
+                "p99_ms": percentile(values, 99),
+                "max_ms": round(values[-1], 2),
+                "status_codes": self.status_codes.get(name, {}),
+                "histogram": histogram
+            }
+        return endpoints
+
+
+def response_json(response):
+    """解析 JSON 响应，响应体不是 JSON 时返回 None"""
+    try:
+        return response.json()
+    except ValueError:
+        return None
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return round(sorted_values[index], 2)
+
+
+async def timed_request(client, stats, name, token=None, json_data=None, scheduled_at=None, **path_params):
+    """发送请求并记录延迟；传入 scheduled_at 时从计划到达时间开始计时，包含排队等待"""
+    method, path = ENDPOINTS[name]
+    headers = {"Authorization": f"Bearer {token}"} if token else None
+    started = scheduled_at if scheduled_at is not None else time.perf_counter()
+    try:
+        response = await client.request(method, path.format(**path_params), json=json_data, headers=headers)
+        status_code = response.status_code
+    except httpx.HTTPError:
+        response = None
+        status_code = None
+    stats.record(name, (time.perf_counter() - started) * 1000, status_code)
+    return response
+
+
+async def scenario_auth(client, stats, ctx, rng, scheduled_at=None):
+    """注册 -> 登录 -> 获取个人资料"""
+    suffix = f"{ctx['run_id']}{rng.randrange(10 ** 8):08d}"
+    password = "Test12345"
+    register_data = {
+        "username": f"load{suffix}",
+        "password": password,
+        "nickname": "压测用户",
+        "email": f"load{suffix}@example.com",
+        "phone": f"1{rng.randrange(10 ** 10):010d}"
+    }
+    response = await timed_request(client, stats, "register", json_data=register_data,
+                                   scheduled_at=scheduled_at)
+    if response is None or response.status_code != 200:
+        return
+
+    response = await timed_request(client, stats, "login", json_data={
+        "account": register_data["username"],
+        "password": password
+    })
+    if response is None or response.status_code != 200:
+        return
+
+    result = response_json(response)
+    if not isinstance(result, dict) or not result.get("access_token"):
+        # 登录返回 200 但没有有效令牌，按登录错误计数
+        stats.record_error("login")
+        return
+    await timed_request(client, stats, "profile", token=result["access_token"])
+
+
+async def scenario_homepage(client, stats, ctx, rng, scheduled_at=None):
+    await timed_request(client, stats, "homepage", scheduled_at=scheduled_at)
+
+
+async def scenario_recipe(client, stats, ctx, rng, scheduled_at=None):
+    await timed_request(client, stats, "recipe_detail", recipe_id=rng.choice(ctx["recipe_ids"]),
+                        scheduled_at=scheduled_at)
+
+
+async def scenario_comments(client, stats, ctx, rng, scheduled_at=None):
+    """获取评论列表，按比例发表评论"""
+    recipe_id = rng.choice(ctx["recipe_ids"])
+    await timed_request(client, stats, "comment_list", recipe_id=recipe_id, scheduled_at=scheduled_at)
+    if ctx["token"] and rng.random() < ctx["comment_post_ratio"]:
+        await timed_request(client, stats, "comment_post", token=ctx["token"], recipe_id=recipe_id, json_data={
+            "content": f"压测评论 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+            "rating": rng.randint(1, 5),
+            "images": []
+        })
+
+
+SCENARIOS = {
+    "auth": scenario_auth,
+    "homepage": scenario_homepage,
+    "recipe": scenario_recipe,
+    "comments": scenario_comments,
+}
+
+
+def parse_mix(text):
+    mix = {}
+    for item in text.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f"未知场景: {name}，可选: {', '.join(SCENARIOS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+async def login_for_token(client, account, password):
+    """获取发表评论使用的令牌"""
+    if not account:
+        return None
+    try:
+        response = await client.post(ENDPOINTS["login"][1], json={"account": account, "password": password})
+    except httpx.HTTPError as e:
+        print(f"登录请求失败，跳过发表评论: {e!r}")
+        return None
+    if response.status_code != 200:
+        print(f"登录失败，跳过发表评论: HTTP {response.status_code}")
+        return None
+    result = response_json(response)
+    if not isinstance(result, dict) or not result.get("access_token"):
+        print("登录响应中没有有效的访问令牌，跳过发表评论")
+        return None
+    return result["access_token"]
+
+
+async def run(args):
+    mix = parse_mix(args.mix)
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    rng = random.Random(args.seed)
+    stats = Stats()
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        ctx = {
+            "run_id": f"{int(time.time()) % 100000:05d}",
+            "recipe_ids": args.recipe_id,
+            "token": await login_for_token(client, args.account, args.password),
+            "comment_post_ratio": args.comment_post_ratio,
+        }
+        deadline = time.perf_counter() + args.duration
+
+        async def run_one(worker_rng, scheduled_at=None):
+            name = worker_rng.choices(names, weights=weights)[0]
+            if scheduled_at is not None:
+                stats.record_queue_wait(name, (time.perf_counter() - scheduled_at) * 1000)
+            await SCENARIOS[name](client, stats, ctx, worker_rng, scheduled_at=scheduled_at)
+
+        started = time.perf_counter()
+        if args.rate > 0:
+            # 开放模型：按泊松过程到达，并发数不超过 concurrency
+            # 延迟从计划到达时间开始计算，排队等待计入延迟，避免协调遗漏
+            semaphore = asyncio.Semaphore(args.concurrency)
+            tasks = set()
+
+            async def limited(worker_rng, scheduled_at):
+                async with semaphore:
+                    await run_one(worker_rng, scheduled_at)
+
+            next_arrival = started
+            while next_arrival < deadline:
+                task = asyncio.create_task(limited(random.Random(rng.random()), next_arrival))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                # 按绝对时间表到达，调度本身的延迟不会推迟后续到达
+                next_arrival += rng.expovariate(args.rate)
+                await asyncio.sleep(max(0, next_arrival - time.perf_counter()))
+            if tasks:
+                await asyncio.gather(*tasks)
+        else:
+            # 封闭模型：concurrency 个虚拟用户持续发起请求
+            async def worker(worker_rng):
+                while time.perf_counter() < deadline:
+                    await run_one(worker_rng)
+
+            await asyncio.gather(*(worker(random.Random(rng.random())) for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "config": {
+            "base_url": args.base_url,
+            "mix": mix,
+            "concurrency": args.concurrency,
+            "rate": args.rate,
+            "duration": args.duration,
+            "seed": args.seed
+        },
+        "elapsed": round(elapsed, 2),
+        "endpoints": stats.report(elapsed),
+        "queue_wait": stats.queue_wait_report()
+    }
+
+
+def print_summary(result):
+    print(f"\n======= 压测结果 ({result['elapsed']}s) =======")
+    print(f"{'接口':<16}{'请求数':>8}{'错误':>6}{'req/s':>9}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for name, item in result["endpoints"].items():
+        print(f"{name:<16}{item['requests']:>8}{item['errors']:>6}{item['throughput']:>9}"
+              f"{item['p50_ms']:>9}{item['p95_ms']:>9}{item['p99_ms']:>9}")
+    if result["queue_wait"]:
+        print("\n排队等待(计划到达至开始执行，已计入上方延迟):")
+        for name, item in result["queue_wait"].items():
+            print(f"{name:<16}{item['scenarios']:>8}{'':>6}{'':>9}"
+                  f"{item['p50_ms']:>9}{item['p95_ms']:>9}{item['p99_ms']:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="异步 HTTP 压测工具")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000", help="本地启动的服务地址")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"场景权重，例如 {DEFAULT_MIX}")
+    parser.add_argument("--concurrency", type=int, default=20, help="最大并发数")
+    parser.add_argument("--rate", type=float, default=0, help="每秒到达的场景数，0 表示封闭模型")
+    parser.add_argument("--duration", type=float, default=30, help="压测时长(秒)")
+    parser.add_argument("--timeout", type=float, default=10, help="单次请求超时(秒)")
+    parser.add_argument("--recipe-id", action="append", default=None, help="菜谱ID，可重复指定")
+    parser.add_argument("--account", help="发表评论使用的账号")
+    parser.add_argument("--password", default="Password123", help="发表评论账号的密码")
+    parser.add_argument("--comment-post-ratio", type=float, default=0.1, help="评论场景中发表评论的比例")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    parser.add_argument("--output", help="JSON 结果输出文件")
+    args = parser.parse_args()
+
+    if not args.recipe_id:
+        args.recipe_id = ["681dc66f64f725c88d76041d"]
+
+    result = asyncio.run(run(args))
+    print_summary(result)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"\n结果已写入 {args.output}")
+
+
+if __name__ == "__main__":
+    main()
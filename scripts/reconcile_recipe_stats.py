@@ -0,0 +1,99 @@
+import asyncio
+from bson import ObjectId
+from pymongo import UpdateOne
+from app.db.mongodb import connect_to_mongo, get_collection
+
+BATCH_SIZE = 500
+
+RESET_STATS = {
+    "stats.commentCount": 0,
+    "stats.ratingSum": 0,
+    "stats.ratingCount": 0,
+    "stats.ratingAvg": 0.0
+}
+
+
+def to_object_id(recipe_id):
+    if isinstance(recipe_id, ObjectId):
+        return recipe_id
+    try:
+        return ObjectId(recipe_id)
+    except Exception:
+        return None
+
+
+async def reconcile_recipe_stats():
+    """按评论集合重新统计菜谱的 commentCount / ratingSum / ratingCount / ratingAvg，修正增量计数的漂移"""
+    print("连接到 MongoDB...")
+    await connect_to_mongo()
+    
+    recipes_collection = get_collection("recipes")
+    comments_collection = get_collection("comments")
+    
+    # 一次聚合得到每个菜谱的评论数和评分汇总；recipe_id 可能存成字符串或 ObjectId，统一转成字符串分组
+    pipeline = [
+        {"$group": {
+            "_id": {"$toString": "$recipe_id"},
+            "commentCount": {"$sum": 1},
+            "ratingSum": {"$sum": {"$cond": [{"$isNumber": "$rating"}, "$rating", 0]}},
+            "ratingCount": {"$sum": {"$cond": [{"$isNumber": "$rating"}, 1, 0]}}
+        }}
+    ]
+    
+    operations = []
+    seen_ids = set()
+    fixed = 0
+    
+    async def flush():
+        nonlocal operations, fixed
+        if operations:
+            result = await recipes_collection.bulk_write(operations, ordered=False)
+            fixed += result.modified_count
+            operations = []
+    
+    async for stat in comments_collection.aggregate(pipeline, allowDiskUse=True):
+        recipe_id = to_object_id(stat["_id"])
+        if recipe_id is None:
+            print(f"跳过无效的菜谱ID: {stat['_id']}")
+            continue
+        seen_ids.add(recipe_id)
+        
+        rating_count = stat["ratingCount"]
+        rating_avg = stat["ratingSum"] / rating_count if rating_count else 0.0
+        operations.append(UpdateOne(
+            {"_id": recipe_id},
+            {"$set": {
+                "stats.commentCount": stat["commentCount"],
+                "stats.ratingSum": stat["ratingSum"],
+                "stats.ratingCount": rating_count,
+                "stats.ratingAvg": rating_avg
+            }}
+        ))
+        
+        if len(operations) >= BATCH_SIZE:
+            await flush()
+    
+    await flush()
+    
+    # 第二遍遍历统计不为零的菜谱，没有任何评论的归零
+    cursor = recipes_collection.find(
+        {"$or": [
+            {"stats.commentCount": {"$gt": 0}},
+            {"stats.ratingCount": {"$gt": 0}}
+        ]},
+        {"_id": 1}
+    )
+    async for recipe in cursor:
+        if recipe["_id"] in seen_ids:
+            continue
+        operations.append(UpdateOne({"_id": recipe["_id"]}, {"$set": RESET_STATS}))
+        if len(operations) >= BATCH_SIZE:
+            await flush()
+    
+    await flush()
+    
+    print(f"统计了 {len(seen_ids)} 个有评论的菜谱，修正了 {fixed} 个菜谱的统计数据")
+
+
+if __name__ == "__main__":
+    asyncio.run(reconcile_recipe_stats())